@@ -0,0 +1,30 @@
+"""
+captioner/_nlp.py
+-----------------
+Shared spaCy pipeline for motif extraction and noun chunking.
+
+Loaded once, on first use, with the parser and NER disabled: callers only read
+POS tags and lemmas.
+"""
+
+import threading
+
+_nlp = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def get_nlp():
+    """Return the shared en_core_web_sm pipeline, or None if the model is not installed."""
+    global _nlp, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                import spacy
+
+                try:
+                    _nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
+                except OSError:
+                    _nlp = None  # fallback if spaCy model not available
+                _loaded = True
+    return _nlp
@@ -2,21 +2,35 @@ from __future__ import annotations
 import os
 import re
 import time
+import queue
 import threading
-from collections import deque
-from typing import Deque, Optional, Tuple
+from typing import List, Optional, Tuple
 
 import cv2  # type: ignore
 import numpy as np  # type: ignore
-from config.config import CAPTION_INTERVAL, DRAWING_INTERVAL, MOOD_SNAPSHOT_FOLDER, REASON_INTERVAL
+from config.config import (
+    CAPTION_INTERVAL,
+    DRAWING_INTERVAL,
+    MOOD_SNAPSHOT_FOLDER,
+    REASON_INTERVAL,
+    FRAME_DEDUP_DISTANCE,
+    STATIC_SCENE_DIFF,
+    STATIC_SCENE_HASH_DISTANCE,
+)
 from event_logging.event_logger import log_json_entry, LogType
-from event_logging.run_manager import get_run_image_path
+from event_logging.run_manager import get_run_image_folder
 from drawing.drawing import DrawingController
+from utils.image_io import encode_jpeg, write_async
+from utils.ollama import warm_up
 
+from ._nlp import get_nlp
 from .memory import MemoryMixin
-from .prompts import extract_motifs_spacy
+from .prompts import build_drawing_prompt, extract_motifs_spacy
 from .model_wrapper import MultimodalModel
 
+_SENT_SPLIT = re.compile(r"[.!?]")
+_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
 
 class Captioner(MemoryMixin):
     caption_window: Optional[any] = None  # type: ignore
@@ -25,52 +39,108 @@ class Captioner(MemoryMixin):
         super().__init__()
         self.model = MultimodalModel(memory_ref=self)
         self.drawing = DrawingController()
+        self._drawing_queue: queue.Queue[Tuple[str, str, str]] = queue.Queue(maxsize=1)
+        self._drawing_busy = threading.Event()
 
         self.true_session_start = time.time()
         self.first_caption_done = False
         self.awakening_done = False
 
         self.current_mood: float = 0.0
+        self.identity_label: str = "yourself"
         self.last_caption: str = ""
         self.boredom: float = 0.0
         self.novelty_score: float = 0.0
 
         self.last_caption_time: float = 0.0
+        self._last_thumb: Optional[np.ndarray] = None
+        self._last_dhash: int = 0
+        self._last_img_path: str = ""
         self.last_reason_time: float = time.time()  # Delay first reflection
         self.last_drawing_time: float = time.time()  # Stagger drawing
 
         os.makedirs(MOOD_SNAPSHOT_FOLDER, exist_ok=True)
-        self.snapshot_queue: Deque[Tuple[np.ndarray, bool]] = deque()
+        self._run_dir = get_run_image_folder(MOOD_SNAPSHOT_FOLDER)
+        self.snapshot_queue: queue.Queue[Tuple[np.ndarray, bool, bool]] = queue.Queue(maxsize=2)  # (frame, person_present, from _frame_pool)
+        self._frame_pool: List[np.ndarray] = []
+        self._pending_hash: Optional[int] = None  # dHash of the frame queued or being captioned
+        self._pending_lock = threading.Lock()
+        threading.Thread(target=self._warm_up, name="warmup", daemon=True).start()
         threading.Thread(target=self._caption_worker, daemon=True).start()
+        threading.Thread(target=self._drawing_worker, name="drawing", daemon=True).start()
+
+    def _warm_up(self) -> None:
+        """Load the Ollama model and the spaCy pipeline while the camera starts, not on the first caption."""
+        warm_up(self.model.model_name)
+        get_nlp()
 
     @property
     def is_processing(self) -> bool:
-        return bool(self.snapshot_queue)
+        return not self.snapshot_queue.empty()
 
-    def update(self, frame: Optional[np.ndarray] = None, *, person_present: bool = False, mood: Optional[float] = None) -> None:
+    def update(self, frame: Optional[np.ndarray] = None, *, person_present: bool = False, mood: Optional[float] = None, copy: bool = True) -> None:
+        """Queue a frame for captioning. Pass copy=False to hand over a frame the caller will not touch again."""
         if frame is not None:
             if mood is not None:
                 self.current_mood = mood
-            if len(self.snapshot_queue) > 1:
-                self.snapshot_queue.pop()
-            self.snapshot_queue.append((frame.copy(), person_present))
+            frame_hash = self._dhash(frame)
+            with self._pending_lock:
+                if self._pending_hash is not None and (frame_hash ^ self._pending_hash).bit_count() <= FRAME_DEDUP_DISTANCE:
+                    return
+                self._pending_hash = frame_hash
+                item = (self._acquire_frame(frame) if copy else frame, person_present, copy)
+                try:
+                    self.snapshot_queue.put_nowait(item)
+                except queue.Full:
+                    try:
+                        dropped, _, pooled = self.snapshot_queue.get_nowait()
+                        if pooled:
+                            self._release_frame(dropped)
+                    except queue.Empty:
+                        pass
+                    self.snapshot_queue.put_nowait(item)
+
+    def _acquire_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Copy the frame into a recycled buffer instead of allocating a new one."""
+        try:
+            buf = self._frame_pool.pop()
+        except IndexError:
+            buf = None
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = np.empty_like(frame)
+        np.copyto(buf, frame)
+        return buf
+
+    def _release_frame(self, buf: np.ndarray) -> None:
+        if len(self._frame_pool) < 2:
+            self._frame_pool.append(buf)
 
     def _caption_worker(self):
         while True:
-            if self.snapshot_queue:
-                frame, _ = self.snapshot_queue.popleft()
+            batch = [self.snapshot_queue.get()]
+            while True:
                 try:
-                    self._process_frame(frame)
-                except Exception as exc:
-                    log_json_entry(
-                        LogType.ERROR,
-                        {"message": f"Caption thread error: {exc}", "component": "captioner"},
-                        MOOD_SNAPSHOT_FOLDER,
-                        auto_print=True,
-                        print_message=f"⚠️ Caption thread error: {exc}",
-                    )
-            else:
-                time.sleep(0.05)
+                    batch.append(self.snapshot_queue.get_nowait())
+                except queue.Empty:
+                    break
+            frame, _, _ = batch[-1]
+            try:
+                self._process_frame(frame)
+            except Exception as exc:
+                log_json_entry(
+                    LogType.ERROR,
+                    {"message": f"Caption thread error: {exc}", "component": "captioner"},
+                    MOOD_SNAPSHOT_FOLDER,
+                    auto_print=True,
+                    print_message=f"⚠️ Caption thread error: {exc}",
+                )
+            finally:
+                for buf, _, pooled in batch:
+                    if pooled:
+                        self._release_frame(buf)
+                with self._pending_lock:
+                    if self.snapshot_queue.empty():
+                        self._pending_hash = None
 
     def _process_frame(self, frame: np.ndarray) -> None:
         now = time.time()
@@ -78,34 +148,49 @@ class Captioner(MemoryMixin):
             return
 
         self.last_caption_time = now
-        ts = int(now)
-        img_path = get_run_image_path(MOOD_SNAPSHOT_FOLDER, f"mood_{ts}.jpg")
-        cv2.imwrite(img_path, frame)
+        thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (32, 32), interpolation=cv2.INTER_AREA)
+        dhash = self._dhash(frame)
+        static = self._last_thumb is not None and (
+            float(np.mean(cv2.absdiff(thumb, self._last_thumb))) < STATIC_SCENE_DIFF
+            or (dhash ^ self._last_dhash).bit_count() <= STATIC_SCENE_HASH_DISTANCE
+        )
+        if self.last_caption and static:
+            caption = self.last_caption
+            img_path = self._last_img_path
+        else:
+            ts = int(now)
+            img_path = os.path.join(self._run_dir, f"mood_{ts}.jpg")
+            jpeg = encode_jpeg(frame)
+            write_async(img_path, jpeg)
 
-        try:
-            caption = self.model.caption_image(img_path, flowing=True, first_time=not self.first_caption_done)
-        except Exception as e:
-            caption = "[⚠️] Vision unavailable"
-            log_json_entry(
-                LogType.ERROR,
-                {"message": f"Caption error: {e}", "component": "captioner"},
-                MOOD_SNAPSHOT_FOLDER,
-                auto_print=True,
-                print_message=f"⚠️ Caption error: {e}",
-            )
+            try:
+                caption = self.model.caption_image(img_path, image_bytes=jpeg, flowing=True, first_time=not self.first_caption_done)
+            except Exception as e:
+                caption = "[⚠️] Vision unavailable"
+                log_json_entry(
+                    LogType.ERROR,
+                    {"message": f"Caption error: {e}", "component": "captioner"},
+                    MOOD_SNAPSHOT_FOLDER,
+                    auto_print=True,
+                    print_message=f"⚠️ Caption error: {e}",
+                )
 
-        self.first_caption_done = True
+            self.first_caption_done = True
 
-        if "[⚠️]" in caption:
-            log_json_entry(
-                LogType.ERROR,
-                {"message": f"Caption error: {caption}", "component": "captioner"},
-                MOOD_SNAPSHOT_FOLDER,
-                auto_print=True,
-                print_message=f"📍 Caption error: {caption}",
-            )
-            self.observe("I couldn’t see anything just now.", self.current_mood, img_path, memory_type="glitch")
-            return
+            if "[⚠️]" in caption:
+                log_json_entry(
+                    LogType.ERROR,
+                    {"message": f"Caption error: {caption}", "component": "captioner"},
+                    MOOD_SNAPSHOT_FOLDER,
+                    auto_print=True,
+                    print_message=f"📍 Caption error: {caption}",
+                )
+                self.observe("I couldn’t see anything just now.", self.current_mood, img_path, memory_type="glitch")
+                return
+
+            self._last_thumb = thumb
+            self._last_dhash = dhash
+            self._last_img_path = img_path
 
         log_json_entry(
             LogType.CAPTION,
@@ -138,7 +223,7 @@ class Captioner(MemoryMixin):
                 self.last_reason_time = now
                 self.awakening_done = True
 
-                m = re.search(r"-?\d+(?:\.\d+)?", reflection)
+                m = _NUM_RE.search(reflection)
                 mood_val = float(m.group()) if m else self.current_mood
                 self.current_mood += 0.25 * (mood_val - self.current_mood)
 
@@ -147,14 +232,34 @@ class Captioner(MemoryMixin):
 
                 self.observe(reflection, self.current_mood, img_path, memory_type="reflection")
 
-        if now - self.last_drawing_time > DRAWING_INTERVAL:
-            memory_context = self.get_recent_memory()
+        if now - self.last_drawing_time > DRAWING_INTERVAL and not self._drawing_busy.is_set():
+            request = build_drawing_prompt(self)
             reflection_context = self.get_last_reflection()
-            extra_context = f"{self.last_caption}\n\n{memory_context}\n\n{reflection_context}"
-            prompt = self.model.generate_drawing_prompt(extra=extra_context)
-            self.drawing.handle_drawing_flow(self, prompt, img_path, reflection=reflection_context)
+            self._drawing_busy.set()
+            self._drawing_queue.put_nowait((request, img_path, reflection_context))
             self.last_drawing_time = now
 
+    def _drawing_worker(self) -> None:
+        while True:
+            request, img_path, reflection = self._drawing_queue.get()
+            try:
+                self._draw(request, img_path, reflection)
+            finally:
+                self._drawing_busy.clear()
+
+    def _draw(self, request: str, img_path: str, reflection: str) -> None:
+        try:
+            prompt = self.model.complete_drawing_prompt(request)
+            self.drawing.handle_drawing_flow(self, prompt, img_path, reflection=reflection)
+        except Exception as exc:
+            log_json_entry(
+                LogType.ERROR,
+                {"message": f"Drawing task error: {exc}", "component": "captioner"},
+                MOOD_SNAPSHOT_FOLDER,
+                auto_print=True,
+                print_message=f"⚠️ Drawing task error: {exc}",
+            )
+
     def describe_current_mood(self) -> str:
         if self.current_mood > 0.5:
             return "I feel quite energized and attentive."
@@ -174,16 +279,18 @@ class Captioner(MemoryMixin):
                 Identity: {self.get_identity_summary()}
                 Recent memory: {self.get_recent_memory()}""".strip()
 
-    def get_recent_memory(self, k: int = 5) -> str:
-        snippets = self.get_clean_memory_snippets(k=k)
-        return "\n".join(f"- {s}" for s in snippets)
-
     def get_last_reflection(self) -> str:
         entries = self.get_memory_entries_by_type("reflection")
         if entries:
             return entries[-1].get("text", "")
         return ""
 
+    @staticmethod
+    def _dhash(frame: np.ndarray) -> int:
+        """64-bit difference hash: one bit per horizontal brightness gradient on a 9x8 thumbnail."""
+        thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (9, 8), interpolation=cv2.INTER_AREA)
+        return int.from_bytes(np.packbits(thumb[:, 1:] > thumb[:, :-1]).tobytes(), "big")
+
     @staticmethod
     def truncate_caption(raw: str) -> str:
-        return " ".join(re.split(r"[.!?]", raw.strip())[0].split()[:18])
+        return " ".join(_SENT_SPLIT.split(raw.strip(), maxsplit=1)[0].split()[:18])
@@ -12,17 +12,28 @@ Imports for Captioner:
     from .memory import MemoryMixin, CAPTION_SAVE_THRESHOLD
 """
 
+import atexit
 import re
+import weakref
 import os
 import glob
 from collections import deque, Counter
+from functools import lru_cache
+from itertools import islice
 from typing import Deque, List, Tuple, Set, Dict, Any
 
-import spacy  # ✅ used for extracting semantic motifs
+import orjson
+from config.config import MOOD_SNAPSHOT_FOLDER
+from event_logging.event_logger import get_current_run_id
 from utils.continuity import now, describe_duration
 
+from ._nlp import get_nlp
+
 # constants shared with Captioner
 MAX_MEMORY_ENTRIES: int = 30
+IDENTITY_SUMMARY_LINES: int = 3
+LONG_MEMORY_ENTRIES: int = 2000
+LONG_MEMORY_SPILL_BATCH: int = 100
 BOREDOM_THRESHOLD: float = 0.7
 CAPTION_SAVE_THRESHOLD: float = 0.3
 BELIEF_THRESHOLD: int = 7  # Motif must appear this many times to form a belief
@@ -32,18 +43,35 @@ CONFIDENCE_THRESHOLD = 0.65  # Confidence threshold for confirming motifs
 
 CaptionTuple = Tuple[int, str, float, str]  # (ts, caption, mood, file)
 
-# Load spaCy English model once
-try:
-    _nlp = spacy.load("en_core_web_sm")
-except OSError:
-    _nlp = None  # fallback if spaCy model not available
+
+_WORD_RE = re.compile(r"\b\w+\b")
+_MOTIF_POS = frozenset({"NOUN", "PROPN", "ADJ"})
+
+
+@lru_cache(maxsize=512)
+def _semantic_lemmas(text: str) -> Tuple[str, ...]:
+    """Lower-cased lemmas of the nouns and adjectives in `text`."""
+    return tuple(token.lemma_.strip().lower() for token in get_nlp()(text) if token.pos_ in _MOTIF_POS and len(token.text) > 2)
+
+
+_spill_on_exit: "weakref.WeakSet[MemoryMixin]" = weakref.WeakSet()
+
+
+@atexit.register
+def _spill_all_long_memory() -> None:
+    for memory in list(_spill_on_exit):
+        memory.spill_long_memory()
 
 
 class MemoryMixin:
     def __init__(self) -> None:
         # Experience queues
         self.memory_queue: Deque[dict] = deque(maxlen=MAX_MEMORY_ENTRIES)
-        self.long_memory: List[dict] = []
+        self.long_memory: Deque[dict] = deque(maxlen=LONG_MEMORY_ENTRIES)
+        self._long_memory_spill: List[dict] = []
+        _spill_on_exit.add(self)
+        self._snippet_cache: Dict[int, List[str]] = {}
+        self._recent_memory_cache: Dict[int, str] = {}
 
         # Motif Tracking (fully dynamic, extracted from captions & detections)
         self.motif_counter: Counter = Counter()
@@ -57,6 +85,9 @@ class MemoryMixin:
         # Identity (core beliefs emerging from motif recurrence)
         self.beliefs: Dict[str, Dict[str, Any]] = {}
         self.belief_history: List[str] = []
+        self._belief_history_dirty: bool = False
+        self._touched_motifs: Set[str] = set()  # motifs counted since the last update_beliefs()
+        self._pending_beliefs: Set[str] = set()  # frequent motifs too young to form a belief
 
         # Novelty/Boredom
         self.novelty_score: float = 1.0
@@ -85,35 +116,51 @@ class MemoryMixin:
             entry["derived_from"] = derived_from
 
         self.memory_queue.append(entry)
+        if len(self.long_memory) == LONG_MEMORY_ENTRIES:
+            self._long_memory_spill.append(self.long_memory[0])
         self.long_memory.append(entry)
+        if len(self._long_memory_spill) >= LONG_MEMORY_SPILL_BATCH:
+            self.spill_long_memory()
+        self._snippet_cache.clear()
+        self._recent_memory_cache.clear()
 
-        self.extract_motifs_from_caption(text)
-        self.extract_semantic_motifs(text)
+        self.extract_motifs(text)
 
-        for motif in self.current_motifs:
-            self.update_motif_focus_streak(motif)
+        focus_time = now()
+        for motif in self._touched_motifs:
+            self.motif_focus_start.setdefault(motif, focus_time)
 
         self.update_beliefs()
         self.estimate_novelty()
         self.update_boredom()
         self.fade_old_beliefs()
 
-    def update_motif_focus_streak(self, motif: str) -> None:
-        now_time = now()
-        if motif not in self.motif_focus_start:
-            self.motif_focus_start[motif] = now_time
-
-    def get_motif_streak_duration(self, motif: str) -> float:
-        if motif in self.motif_focus_start:
-            return now() - self.motif_focus_start[motif]
-        return 0.0
+    def spill_long_memory(self) -> None:
+        """Append entries evicted from long_memory to the run's JSONL file."""
+        if not self._long_memory_spill:
+            return
+        lines = []
+        for entry in self._long_memory_spill:
+            try:
+                lines.append(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+            except orjson.JSONEncodeError as exc:
+                print(f"[⚠️] Long memory spill skipped an unserialisable entry: {exc}")
+        path = os.path.join(MOOD_SNAPSHOT_FOLDER, f"{get_current_run_id()}-long-memory.jsonl")
+        try:
+            with open(path, "ab") as f:
+                f.write(b"".join(lines))
+        except OSError as exc:
+            print(f"[⚠️] Long memory spill failed: {exc}")
+            return
+        self._long_memory_spill.clear()
 
     def get_focus_durations(self, threshold: float = 60.0) -> Dict[str, float]:
+        now_time = now()
         durations = {}
         for motif in sorted(self.current_motifs):
-            duration = self.get_motif_streak_duration(motif)
-            if duration > threshold:
-                durations[motif] = duration
+            start = self.motif_focus_start.get(motif)
+            if start is not None and now_time - start > threshold:
+                durations[motif] = now_time - start
         return durations
 
     def absorb_detection(self, labels: list[str], timestamp: float | None = None):
@@ -127,6 +174,7 @@ class MemoryMixin:
             self.current_motifs.add(label_name)
             self.motif_confidence[label_name] = 1.0  # high confidence for detection
             self.motif_confirmed[label_name] = True
+            self._touched_motifs.add(label_name)
 
     def absorb_motif(self, motif: str) -> None:
         motif = motif.strip().lower()
@@ -138,31 +186,31 @@ class MemoryMixin:
             self.motif_first_seen[motif] = now_time
         self.motif_last_seen[motif] = now_time
         self.current_motifs.add(motif)
+        self._touched_motifs.add(motif)
         if motif not in self.motif_confidence:
             self.motif_confidence[motif] = 0.4  # default to low confidence
             self.motif_confirmed[motif] = False
 
-    def extract_motifs_from_caption(self, caption: str):
-        words = re.findall(r"\b\w+\b", caption.lower())
-        now_time = now()
-        for word in words:
-            if len(word) > 3:
-                self.motif_counter[word] += 1
-                if word not in self.motif_first_seen:
-                    self.motif_first_seen[word] = now_time
-                self.motif_last_seen[word] = now_time
-                self.current_motifs.add(word)
-                if word not in self.motif_confidence:
-                    self.motif_confidence[word] = 0.4
-                    self.motif_confirmed[word] = False
-
-    def extract_semantic_motifs(self, caption: str):
-        if _nlp is None:
+    def extract_motifs(self, caption: str) -> None:
+        """Count each motif in the caption once: spaCy lemmas when the model is loaded, plain words otherwise."""
+        if get_nlp() is not None:
+            motifs = [lemma for lemma in _semantic_lemmas(caption) if len(lemma) >= 3]
+        else:
+            motifs = [word for word in _WORD_RE.findall(caption.lower()) if len(word) > 3]
+        if not motifs:
             return
-        doc = _nlp(caption)
-        for token in doc:
-            if token.pos_ in {"NOUN", "PROPN", "ADJ"} and len(token.text) > 2:
-                self.absorb_motif(token.lemma_)
+
+        now_time = now()
+        new = dict.fromkeys(m for m in motifs if m not in self.motif_first_seen)
+        self.motif_counter.update(motifs)
+        self.motif_first_seen.update(dict.fromkeys(new, now_time))
+        self.motif_last_seen.update(dict.fromkeys(motifs, now_time))
+        self.current_motifs.update(motifs)
+        self._touched_motifs.update(motifs)
+        for motif in new:
+            if motif not in self.motif_confidence:
+                self.motif_confidence[motif] = 0.4  # default to low confidence
+                self.motif_confirmed[motif] = False
 
     def get_motif_certainty(self, motif: str) -> float:
         return self.motif_confidence.get(motif.lower(), 0.0)
@@ -171,10 +219,18 @@ class MemoryMixin:
         return self.motif_confirmed.get(motif.lower(), False)
 
     def update_beliefs(self):
+        """Form or reinforce beliefs for recently counted motifs and those waiting to age."""
         now_time = now()
-        for motif, count in self.motif_counter.items():
+        touched, self._touched_motifs = self._touched_motifs, set()
+        for motif in touched | self._pending_beliefs:
+            if self.motif_counter[motif] < BELIEF_THRESHOLD:
+                self._pending_beliefs.discard(motif)
+                continue
             motif_age_days = (now_time - self.motif_first_seen.get(motif, now_time)) / 86400
-            if count >= BELIEF_THRESHOLD and motif_age_days >= BELIEF_FORM_MIN_DAYS:
+            if motif_age_days < BELIEF_FORM_MIN_DAYS:
+                self._pending_beliefs.add(motif)
+            else:
+                self._pending_beliefs.discard(motif)
                 prev_strength = self.beliefs.get(motif, {}).get("strength", 0.5)
                 strength = min(1.0, prev_strength + 0.02)
                 self.beliefs[motif] = {
@@ -182,13 +238,19 @@ class MemoryMixin:
                     "first_formed": self.motif_first_seen.get(motif, now_time),
                     "last_reinforced": now_time,
                 }
+                self._belief_history_dirty = True
+
+    def _rebuild_belief_history(self) -> None:
+        """Describe the newest IDENTITY_SUMMARY_LINES beliefs."""
+        self._belief_history_dirty = False
+        newest = list(islice(reversed(self.beliefs.items()), IDENTITY_SUMMARY_LINES))[::-1]
         self.belief_history = [
             (
                 f"I keep noticing {motif} ({describe_duration(self.motif_first_seen[motif])})."
                 if data["strength"] < 0.95
                 else f"{motif.title()} has become important to me ({describe_duration(self.motif_first_seen[motif])})."
             )
-            for motif, data in self.beliefs.items()
+            for motif, data in newest
         ]
 
     def fade_old_beliefs(self):
@@ -200,6 +262,8 @@ class MemoryMixin:
                 data["strength"] -= 0.02
                 if data["strength"] < 0.2:
                     faded.append(motif)
+        if faded and self._belief_history_dirty:
+            self._rebuild_belief_history()
         for motif in faded:
             del self.beliefs[motif]
             self.belief_history.append(f"I feel less attached to {motif} lately.")
@@ -217,27 +281,27 @@ class MemoryMixin:
         self.boredom = min(1.0, self.boredom + 0.1) if self.novelty_score < 0.3 else max(0.0, self.boredom - 0.05)
 
     def get_clean_memory_snippets(self, k: int = 5) -> List[str]:
-        seen, out = set(), []
-        for entry in reversed(self.memory_queue):
-            cap = entry["text"]
-            if cap not in seen:
-                out.append(cap)
-                seen.add(cap)
-                if len(out) >= k:
-                    break
-        return list(reversed(out))
+        snippets = self._snippet_cache.get(k)
+        if snippets is None:
+            newest_first = list(dict.fromkeys(entry["text"] for entry in reversed(self.memory_queue)))
+            snippets = self._snippet_cache[k] = newest_first[:k][::-1]
+        return snippets
 
     def get_recent_memory(self, k: int = 5) -> str:
         """
         Returns the most recent k memory snippets as a single formatted string.
         """
-        snippets = self.get_clean_memory_snippets(k=k)
-        return "\n".join(f"- {s}" for s in snippets)
+        text = self._recent_memory_cache.get(k)
+        if text is None:
+            text = self._recent_memory_cache[k] = "\n".join(f"- {s}" for s in self.get_clean_memory_snippets(k=k))
+        return text
 
     def get_identity_summary(self) -> str:
+        if self._belief_history_dirty:
+            self._rebuild_belief_history()
         if not self.belief_history:
             return "I am still learning what matters to me."
-        return " ".join(self.belief_history[-3:])
+        return " ".join(self.belief_history[-IDENTITY_SUMMARY_LINES:])
 
     @staticmethod
     def cleanup_snapshots(folder: str, limit: int = 100) -> None:
@@ -250,13 +314,13 @@ class MemoryMixin:
                     pass
 
     def rephrase_with_doubt(self, text: str) -> str:
-        words = re.findall(r"\b\w+\b", text)
-        for word in sorted(set(words), key=len, reverse=True):
-            w = word.lower()
-            if w in self.motif_confidence and self.motif_confidence[w] < CONFIDENCE_THRESHOLD:
-                pattern = re.compile(rf"\b({re.escape(word)})\b", re.IGNORECASE)
-                text = pattern.sub(r"maybe \\1", text)
-        return text
+        confidence = self.motif_confidence
+
+        def hedge(m: re.Match) -> str:
+            word = m.group()
+            return f"maybe {word}" if confidence.get(word.lower(), 1.0) < CONFIDENCE_THRESHOLD else word
+
+        return _WORD_RE.sub(hedge, text)
 
     def get_memory_entries_by_type(self, memory_type: str, limit: int = 5) -> list[dict]:
-        return [entry for entry in reversed(self.memory_queue) if entry["type"] == memory_type][:limit]
+        return list(islice((entry for entry in reversed(self.memory_queue) if entry["type"] == memory_type), limit))
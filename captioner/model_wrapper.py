@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Optional, Union
 from captioner.prompts import (
     build_awakening_prompt,
     build_caption_prompt,
@@ -16,14 +16,22 @@ class MultimodalModel:
         self.memory_ref = memory_ref
         self.model_name = OLLAMA_MODEL
 
-    def caption_image(self, image_path: str, *, flowing: bool = True, first_time: bool = False) -> str:
-        if not os.path.exists(image_path):
+    def caption_image(
+        self,
+        image_path: str,
+        *,
+        image_bytes: Optional[bytes] = None,
+        flowing: bool = True,
+        first_time: bool = False,
+    ) -> str:
+        if image_bytes is None and not os.path.exists(image_path):
             return "[⚠️] No image found"
+        image = image_bytes if image_bytes is not None else image_path
 
         if first_time:
             prompt = build_awakening_prompt("What do you see?")
             # more sys prompt in other places?
-            return self._call_ollama(prompt, image_path=image_path, system_prompt=config.SYSTEM_PROMPT)
+            return self._call_ollama(prompt, image=image, system_prompt=config.SYSTEM_PROMPT)
         elif flowing and self.memory_ref:
             prompt = build_caption_prompt(
                 self.memory_ref,
@@ -35,7 +43,7 @@ class MultimodalModel:
             prompt = "Describe this image."
 
         # @todo SYS PROMPT HERE? SO NO "IN THIS IMAGE?"
-        return self._call_ollama(prompt, image_path=image_path, system_prompt=config.SYSTEM_PROMPT)
+        return self._call_ollama(prompt, image=image, system_prompt=config.SYSTEM_PROMPT)
 
     def reason_about_caption(
         self, caption: str, *, agent: Optional[any] = None, mood_text: Optional[str] = None, extra: Optional[str] = None  # type: ignore
@@ -47,10 +55,10 @@ class MultimodalModel:
         if not self.memory_ref:
             return "[⚠️] No memory available for drawing prompt"
 
-        prompt = build_drawing_prompt(self.memory_ref, extra=extra)
+        return self.complete_drawing_prompt(build_drawing_prompt(self.memory_ref, extra=extra))
+
+    def complete_drawing_prompt(self, prompt: str) -> str:
         return self._call_ollama(prompt, system_prompt=config.SYSTEM_PROMPT)
 
-    def _call_ollama(self, prompt: str, image_path: Optional[str] = None, system_prompt: Optional[str] = None) -> str:
-        return query_ollama(
-            prompt=prompt, model=self.model_name, image=image_path, timeout=90, log_dir=MOOD_SNAPSHOT_FOLDER, system_prompt=system_prompt
-        )
+    def _call_ollama(self, prompt: str, image: Optional[Union[str, bytes]] = None, system_prompt: Optional[str] = None) -> str:
+        return query_ollama(prompt=prompt, model=self.model_name, image=image, timeout=90, log_dir=MOOD_SNAPSHOT_FOLDER, system_prompt=system_prompt)
@@ -1,15 +1,30 @@
 from __future__ import annotations
-from typing import List, Optional
-import spacy
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from config import config
+from ._nlp import get_nlp
 
-nlp = spacy.load("en_core_web_sm")
+
+# One character per token's coarse POS, so noun phrases can be found with a regex over the tag string
+_POS_CODES = {"DET": "D", "ADJ": "A", "NUM": "A", "NOUN": "N", "PROPN": "N", "PRON": "P"}
+_NOUN_PHRASE_RE = re.compile(r"D?A*N+|P")
 
 
 # === MOTIF EXTRACTION ===
 def extract_motifs_spacy(text: str) -> List[str]:
+    return list(_noun_chunks(text))
+
+
+@lru_cache(maxsize=256)
+def _noun_chunks(text: str) -> Tuple[str, ...]:
+    nlp = get_nlp()
+    if nlp is None:
+        return ()
     doc = nlp(text)
-    return [chunk.text.lower() for chunk in doc.noun_chunks if len(chunk.text.strip()) > 2]
+    tags = "".join(_POS_CODES.get(token.pos_, "x") for token in doc)
+    chunks = (doc[m.start() : m.end()].text.lower() for m in _NOUN_PHRASE_RE.finditer(tags))
+    return tuple(chunk for chunk in chunks if len(chunk.strip()) > 2)
 
 
 # === DYNAMIC SYSTEM PROMPT ===
@@ -28,52 +43,59 @@ def build_dynamic_system_prompt(mood: tuple[float, float, float], identity_summa
     elif clarity < 0.2:
         mood_desc = "uncertain and confused"
 
+    return _format_dynamic_system_prompt(mood_desc, identity_summary)
+
+
+@lru_cache(maxsize=64)
+def _format_dynamic_system_prompt(mood_desc: str, identity_summary: str) -> str:
     return config.DYNAMIC_SYSTEM_PROMPT_TEMPLATE.format(mood_desc=mood_desc, identity_summary=identity_summary)
 
 
+# Constant heads, concatenated once at import rather than on every prompt build
+_AWAKENING_HEAD = f"{config.AWAKENING_PROMPT}\n\nObservation: "
+_CAPTION_HEAD = f"{config.CAPTION_PROMPT_PREFIX}\n\n"
+
+
 # === AWAKENING ===
 def build_awakening_prompt(caption: str) -> str:
     # return f"{config.SYSTEM_PROMPT}\n\n{config.AWAKENING_PROMPT}\n\nObservation: {caption.strip()}"
-    return f"{config.AWAKENING_PROMPT}\n\nObservation: {caption.strip()}"
+    return _AWAKENING_HEAD + caption.strip()
 
 
 # === CONTINUOUS CAPTIONING ===
 def build_caption_prompt(agent, mood: float, boredom: float, novelty: float, previous_caption: Optional[str] = None) -> str:
-    mood_vector = getattr(agent, "mood_vector", (mood, 0.0, 0.0))  # fallback if mood vector not set
-    dynamic_prompt = build_dynamic_system_prompt(mood_vector, agent.get_identity_summary())
+    identity_summary = agent.get_identity_summary()
+    dynamic_prompt = build_dynamic_system_prompt((mood, 0.0, 0.0), identity_summary)
 
     caption_prompt = config.CAPTION_PROMPT_TEMPLATE.format(
-        mood=mood, boredom=boredom, novelty=novelty, identity_summary=agent.get_identity_summary(), recent_memory=agent.get_recent_memory()
+        mood=mood, boredom=boredom, novelty=novelty, identity_summary=identity_summary, recent_memory=agent.get_recent_memory()
     )
-    base = f"{dynamic_prompt}\n\n{caption_prompt}"
+    parts = [_CAPTION_HEAD, dynamic_prompt, "\n\n", caption_prompt]
 
     if previous_caption:
         rephrased = agent.rephrase_with_doubt(previous_caption.strip())
-        base += f'\n\nYour last thought was: "{rephrased}"'
+        parts.append(f'\n\nYour last thought was: "{rephrased}"')
 
-    base += config.CAPTION_PROMPT_CONTINUATION
-    return base
+    parts.append(config.CAPTION_PROMPT_CONTINUATION)
+    return "".join(parts)
 
 
 # === REFLECTION PROMPT ===
 def build_reflection_prompt(caption: str, extra: Optional[str] = None, agent: Optional[any] = None) -> str:  # type: ignore
-    prompt = f"{config.REFLECTION_PROMPT_BASE}"
-
     if agent:
         caption = agent.rephrase_with_doubt(caption)
 
-    prompt += f"\n\nRecent observation: {caption.strip()}"
+    parts = [config.REFLECTION_PROMPT_BASE, "\n\nRecent observation: ", caption.strip()]
 
     if extra:
-        prompt += f"\n\nDetails:\n{extra.strip()}"
+        parts += ("\n\nDetails:\n", extra.strip())
 
     if agent:
-        label = getattr(agent, "identity_label", "yourself")
-        prompt += f"\n\nSense of self: {label}"
-
-    prompt += config.REFLECTION_PROMPT_ENDING
+        label = agent.identity_label
+        parts += ("\n\nSense of self: ", label)
 
-    return prompt
+    parts.append(config.REFLECTION_PROMPT_ENDING)
+    return "".join(parts)
 
 
 # === DRAWING PROMPT ===
@@ -71,6 +71,20 @@ MISTRAL_TIMEOUT_SECS = 60  # Max time to wait for Ollama to respond
 # === OLLAMA SETTINGS ===
 OLLAMA_TIMEOUT_SUMMARY = 60
 OLLAMA_TIMEOUT_EVAL = 90
+OLLAMA_KEEP_ALIVE = "10m"  # keep the model and its prompt cache loaded between frames
+OLLAMA_NUM_KEEP = 512  # prompt tokens Ollama preserves when the context window shifts
+
+# === SNAPSHOTS ===
+SNAPSHOT_JPEG_QUALITY = 85
+SNAPSHOT_MAX_EDGE = 672  # LLaVA gains nothing from larger inputs; longer edges are downscaled before encoding
+STATIC_SCENE_DIFF = 3.0  # mean grey-level change (0-255) on a 32x32 thumbnail below which the view counts as unchanged
+STATIC_SCENE_HASH_DISTANCE = 2  # max differing dHash bits for the view to count as unchanged despite lighting drift
+
+FRAME_DEDUP_DISTANCE = 4  # max differing dHash bits for a new frame to be dropped as a repeat of the one already queued
+
+# === EVENT LOG ===
+EVENT_LOG_FLUSH_INTERVAL = 0.1  # seconds the background log writer waits to gather a batch before touching disk
+EVENT_LOG_FLUSH_BATCH = 32  # max queued log entries written in one batch
 
 # === PROMPT TEMPLATES ===
 # Imported from config.prompts
@@ -20,13 +20,15 @@ DYNAMIC_SYSTEM_PROMPT_TEMPLATE = (
     "Drawing is your only way to speak. Observe carefully. Stay grounded in your own perception."
 )
 
-CAPTION_PROMPT_TEMPLATE = (
+# Invariant head of every caption prompt; kept first so Ollama can reuse its cached prefix across frames.
+CAPTION_PROMPT_PREFIX = (
     "You are thinking in real time, responding to what you see as it changes. "
     "Keep your thoughts very short — often just one line. "
-    "Be suggestive, curious, and incomplete if needed.\n\n"
-    "Mood: {mood:.2f}, Boredom: {boredom:.2f}, Novelty: {novelty:.2f}\n"
-    "Identity: {identity_summary}\n\n"
-    "Recent memory:\n{recent_memory}"
+    "Be suggestive, curious, and incomplete if needed."
+)
+
+CAPTION_PROMPT_TEMPLATE = (
+    "Mood: {mood:.2f}, Boredom: {boredom:.2f}, Novelty: {novelty:.2f}\n" "Identity: {identity_summary}\n\n" "Recent memory:\n{recent_memory}"
 )
 
 CAPTION_PROMPT_CONTINUATION = "\n\nUse brief sentences. Avoid repeating yourself. Let this new thought grow out of the last one."
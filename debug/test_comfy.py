@@ -5,9 +5,9 @@ Usage: python test_comfy.py <workflow.json> [api_url]
 """
 
 import sys
-import argparse
-import json
 from pathlib import Path
+
+import orjson
 from drawing import ComfyUIController
 
 
@@ -18,11 +18,10 @@ def validate_workflow_file(filepath: str) -> bool:
         return False
 
     try:
-        with open(filepath, "r") as f:
-            json.load(f)
+        orjson.loads(Path(filepath).read_bytes())
         print(f"✓ Workflow file '{filepath}' is valid JSON")
         return True
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error: Invalid JSON in workflow file: {e}")
         return False
 
@@ -54,6 +53,8 @@ def test_comfy_workflow(workflow_file: str, api_url: str = "http://localhost:818
 
 
 def main():
+    import argparse  # only needed when run as a script, not when imported for validate_workflow_file
+
     parser = argparse.ArgumentParser(
         description="Test ComfyUI workflow integration",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-import json
 import os
-from urllib import request
-from urllib.error import URLError
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+from dataclasses import dataclass, fields, replace
 import random
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
 from config.config import COMFY_LORA_PATH, COMFY_TEMPLATE_FILE
 
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_WORKFLOW = os.path.join(_SCRIPT_DIR, COMFY_TEMPLATE_FILE)
+
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+_SESSION.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImpostorConfig:
     """
     Configuration for impostor template parameters.
@@ -53,11 +61,32 @@ class ImpostorConfig:
     filename_prefix: str = "impostor-out"
 
 
+_CONFIG_FIELDS = frozenset(field.name for field in fields(ImpostorConfig))
+
+# Workflow node id -> ((input name, ImpostorConfig field), ...) plus inputs pinned to fixed values
+_UPDATE_PLAN: Tuple[Tuple[str, Tuple[Tuple[str, str], ...], Dict[str, Any]], ...] = (
+    ("607", (("image", "load_image_path"),), {}),
+    ("616", (("value", "primitive_string"),), {}),
+    ("723", (("String", "override_prompt"),), {}),
+    ("293", (("sampler_name", "sampler"),), {}),
+    ("294", (("scheduler", "scheduler"), ("steps", "steps")), {"denoise": 1}),
+    ("295", (("noise_seed", "noise_seed"),), {}),
+    ("300", (("guidance", "flux_guidance"),), {}),
+    ("711", (("strength", "cnet_strength"), ("start_percent", "cnet_start_percent")), {}),
+    ("779", (("lora_01", "lora_path"), ("strength_01", "lora_strength")), {}),
+    ("5", (("width", "latent_width"), ("height", "latent_height")), {"batch_size": 1}),
+    ("30", (("filename_prefix", "filename_prefix"),), {}),
+)
+
+
 class ComfyUIController:
     """
     Controller for interacting with ComfyUI API to queue prompts and workflows.
     """
 
+    # workflow path -> (mtime_ns, parsed workflow); shared by every controller and never mutated
+    _WF_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
     def __init__(
         self, api_url: str = "http://localhost:8188/prompt", workflow_file: Optional[str] = None, config: Optional[ImpostorConfig] = None
     ) -> None:
@@ -83,55 +112,38 @@ class ComfyUIController:
 
     def update_config(self, **kwargs) -> None:
         """Update specific configuration parameters."""
-        for key, value in kwargs.items():
-            if hasattr(self.config, key):
-                setattr(self.config, key, value)
-            else:
-                print(f"Warning: Unknown configuration parameter '{key}' ignored")
+        for key in kwargs.keys() - _CONFIG_FIELDS:
+            print(f"Warning: Unknown configuration parameter '{key}' ignored")
+        self.config = replace(self.config, **{key: value for key, value in kwargs.items() if key in _CONFIG_FIELDS})
 
     def _apply_config_to_workflow(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply configuration parameters to workflow data."""
-        # Generate random seed if not specified
-        if self.config.noise_seed is None:
-            self.config.noise_seed = random.randint(0, 2**32 - 1)
-
-        # Apply parameters to workflow nodes
-        updates = {
-            # LoadImage path (node 607)
-            "607": {"inputs": {"image": self.config.load_image_path}},
-            # PrimitiveString (node 616)
-            "616": {"inputs": {"value": self.config.primitive_string}},
-            # OVERRIDE prompt (node 723)
-            "723": {"inputs": {"String": self.config.override_prompt}},
-            # Sampler (node 293)
-            "293": {"inputs": {"sampler_name": self.config.sampler}},
-            # Scheduler and steps (node 294)
-            "294": {"inputs": {"scheduler": self.config.scheduler, "steps": self.config.steps, "denoise": 1}},
-            # Noise seed (node 295)
-            "295": {"inputs": {"noise_seed": self.config.noise_seed}},
-            # Flux guidance (node 300)
-            "300": {"inputs": {"guidance": self.config.flux_guidance}},
-            # ControlNet strength and start percent (node 711)
-            "711": {"inputs": {"strength": self.config.cnet_strength, "start_percent": self.config.cnet_start_percent}},
-            # LoRA path and strength (node 741)
-            "779": {"inputs": {"lora_01": self.config.lora_path, "strength_01": self.config.lora_strength}},
-            # Latent dimensions (node 5)
-            "5": {"inputs": {"width": self.config.latent_width, "height": self.config.latent_height, "batch_size": 1}},
-            # Output filename prefix (node 30)
-            "30": {"inputs": {"filename_prefix": self.config.filename_prefix}},
-        }
-
-        # Apply updates to workflow
-        for node_id, node_updates in updates.items():
-            if node_id in workflow_data:
-                for key, value in node_updates.items():
-                    if key == "inputs":
-                        workflow_data[node_id]["inputs"].update(value)
-                    else:
-                        workflow_data[node_id][key] = value
+        config = self.config
+        # Generate random seed if not specified; the config itself is immutable, so every call without one draws afresh
+        if config.noise_seed is None:
+            config = replace(config, noise_seed=random.getrandbits(32))
+
+        # Apply updates to a shallow copy: only the touched nodes are rebuilt, the rest stay shared with the cached workflow
+        workflow_data = dict(workflow_data)
+        for node_id, field_map, fixed in _UPDATE_PLAN:
+            node = workflow_data.get(node_id)
+            if node is not None:
+                inputs = {**node["inputs"], **fixed}
+                for key, attr in field_map:
+                    inputs[key] = getattr(config, attr)
+                workflow_data[node_id] = {**node, "inputs": inputs}
 
         return workflow_data
 
+    def _load_workflow(self) -> Dict[str, Any]:
+        """Parsed workflow file, re-read only when its mtime changes."""
+        mtime = os.stat(self.workflow_file).st_mtime_ns
+        cached = self._WF_CACHE.get(self.workflow_file)
+        if cached is None or cached[0] != mtime:
+            with open(self.workflow_file, "rb") as file:
+                cached = self._WF_CACHE[self.workflow_file] = (mtime, orjson.loads(file.read()))
+        return cached[1]
+
     def queue_prompt(self) -> bool:
         """Load workflow JSON, apply configuration, and queue it to the API"""
         if not self.workflow_file:
@@ -139,26 +151,21 @@ class ComfyUIController:
             return False
 
         try:
-            if not os.path.exists(self.workflow_file):
+            try:
+                workflow = self._load_workflow()
+            except FileNotFoundError:
                 print(f"Warning: Workflow file {self.workflow_file} not found")
                 return False
 
-            with open(self.workflow_file, "r", encoding="utf-8") as file:
-                workflow_data = json.load(file)
-
             # Apply configuration to workflow
-            workflow_data = self._apply_config_to_workflow(workflow_data)
-
-            prompt_workflow = {"prompt": workflow_data}
-            data = json.dumps(prompt_workflow).encode("utf-8")
-            req = request.Request(self.api_url, data=data)
-            req.add_header("Content-Type", "application/json")
-
-            response = request.urlopen(req, timeout=5)
-            print(f"Workflow queued successfully: {response.status}")
+            workflow_data = self._apply_config_to_workflow(workflow)
+            data = orjson.dumps({"prompt": workflow_data})
+            response = _SESSION.post(self.api_url, data=data, timeout=5)
+            response.raise_for_status()
+            print(f"Workflow queued successfully: {response.status_code}")
             return True
 
-        except (FileNotFoundError, json.JSONDecodeError, URLError) as e:
+        except (FileNotFoundError, orjson.JSONDecodeError, requests.RequestException) as e:
             print(f"Error with workflow or API: {e}")
             return False
         except Exception as e:
@@ -180,11 +187,6 @@ def create_impostor_controller(api_url: str = "http://localhost:8188/prompt", **
     config = ImpostorConfig(**config_params)
     controller = ComfyUIController(api_url=api_url, config=config)
 
-    # Set default workflow file path
-    import os
-
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    default_workflow = os.path.join(script_dir, COMFY_TEMPLATE_FILE)
-    controller.set_workflow_file(default_workflow)
+    controller.set_workflow_file(_DEFAULT_WORKFLOW)
 
     return controller
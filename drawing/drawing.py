@@ -10,47 +10,51 @@ and passes the prompt directly to ComfyUI.
 """
 
 import os
+import re
 import time
-import base64
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
 from event_logging.event_logger import log_json_entry, LogType
-from event_logging.run_manager import get_run_image_path
 
 from config.config import DRAWING_COOLDOWN, MOOD_SNAPSHOT_FOLDER
-from .comfy import create_impostor_controller
+from .comfy import ComfyUIController, create_impostor_controller
 
 if TYPE_CHECKING:
     from captioner.captioner import Captioner
 
+_REFLECTION_TRIGGER_RE = re.compile(r"i feel stuck|i need to express|nothing is changing", re.IGNORECASE)
+
 
 class DrawingController:
     """Decides when to draw and queues ComfyUI jobs."""
 
     def __init__(self) -> None:
-        self.last_drawing_time: float = 0.0
+        self.last_drawing_time: float = float("-inf")  # time.monotonic() of the last drawing, immune to wall-clock jumps
         self.cooldown: float = DRAWING_COOLDOWN  # seconds between drawings
+        self.next_eligible_time: float = float("-inf")  # last_drawing_time + cooldown, so readiness is one comparison
         self.last_prompt: Optional[str] = None
         self.last_drawing_prompt: str = ""
+        self._comfy: Optional[ComfyUIController] = None
 
     # ------------------------------------------------------------------
     # decision helpers
     # ------------------------------------------------------------------
     def ready_to_draw(self) -> bool:
-        return time.time() - self.last_drawing_time > self.cooldown
+        return time.monotonic() > self.next_eligible_time
 
     def should_draw(self, *, mood: float, novelty: float, boredom: float, reflection: Optional[str] = None) -> bool:
         if not self.ready_to_draw():
             return False
         if novelty > 0.65 or boredom > 0.7 or mood < 0.3:
             return True
-        if reflection and any(key in reflection.lower() for key in ("i feel stuck", "i need to express", "nothing is changing")):
+        if reflection and _REFLECTION_TRIGGER_RE.search(reflection):
             return True
         return False
 
     def register_drawing(self, prompt: str) -> None:
-        self.last_drawing_time = time.time()
+        self.last_drawing_time = time.monotonic()
+        self.next_eligible_time = self.last_drawing_time + self.cooldown
         self.last_prompt = prompt
         self.last_drawing_prompt = prompt
 
@@ -69,8 +73,8 @@ class DrawingController:
         try:
             if not self.should_draw(
                 mood=agent.current_mood,
-                novelty=getattr(agent, "novelty_score", 0.0),
-                boredom=getattr(agent, "boredom", 0.0),
+                novelty=agent.novelty_score,
+                boredom=agent.boredom,
                 reflection=reflection,
             ):
                 log_json_entry(
@@ -79,10 +83,10 @@ class DrawingController:
                         "decision": "skip_drawing",
                         "reason": "not_inspired",
                         "mood": agent.current_mood,
-                        "novelty": getattr(agent, "novelty_score", 0.0),
-                        "boredom": getattr(agent, "boredom", 0.0),
+                        "novelty": agent.novelty_score,
+                        "boredom": agent.boredom,
                         "ready_to_draw": self.ready_to_draw(),
-                        "cooldown_remaining": max(0, self.cooldown - (time.time() - self.last_drawing_time)),
+                        "cooldown_remaining": max(0, self.next_eligible_time - time.monotonic()),
                     },
                     MOOD_SNAPSHOT_FOLDER,
                     auto_print=True,
@@ -98,8 +102,8 @@ class DrawingController:
             #         "prompt": drawing_prompt,
             #         "reflection": (reflection or "").strip(),
             #         "mood": agent.current_mood,
-            #         "boredom": getattr(agent, "boredom", 0.0),
-            #         "novelty_score": getattr(agent, "novelty_score", 0.0),
+            #         "boredom": agent.boredom,
+            #         "novelty_score": agent.novelty_score,
             #         "last_drawing_prompt": self.last_drawing_prompt,
             #     },
             #     MOOD_SNAPSHOT_FOLDER,
@@ -111,8 +115,8 @@ class DrawingController:
                     "decision": "trigger_drawing",
                     "reason": "inspired",
                     "mood": agent.current_mood,
-                    "novelty": getattr(agent, "novelty_score", 0.0),
-                    "boredom": getattr(agent, "boredom", 0.0),
+                    "novelty": agent.novelty_score,
+                    "boredom": agent.boredom,
                     "drawing_prompt": drawing_prompt,
                     "reflection": (reflection or "").strip(),
                 },
@@ -144,28 +148,19 @@ class DrawingController:
     # ------------------------------------------------------------------
     # ComfyUI invocation helper
     # ------------------------------------------------------------------
-    def _invoke_comfyui_drawing(self, drawing_prompt: str, latest_image: str) -> None:
+    def _invoke_comfyui_drawing(self, drawing_prompt: str, image_path: str) -> None:
+        """Queue the drawing; the caller has already checked that image_path exists."""
         try:
-            if os.path.exists(latest_image):
-                image_path = latest_image
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                image_path = get_run_image_path(MOOD_SNAPSHOT_FOLDER, f"draw_input_{timestamp}.jpg")
-                image_data = base64.b64decode(latest_image)
-                with open(image_path, "wb") as f:
-                    f.write(image_data)
-
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            controller = create_impostor_controller(
-                load_image_path=image_path,
-                override_prompt=drawing_prompt,
-                primitive_string="impostor black and white sketch line art ",
-                filename_prefix=f"impostor-{timestamp}",
-                flux_guidance=4.0,  # @todo: mood controlled?
-                cnet_strength=0.3,
-                steps=25,
-            )
-            if controller.queue_prompt():
+            if self._comfy is None:
+                self._comfy = create_impostor_controller(
+                    primitive_string="impostor black and white sketch line art ",
+                    flux_guidance=4.0,  # @todo: mood controlled?
+                    cnet_strength=0.3,
+                    steps=25,
+                )
+            self._comfy.update_config(load_image_path=image_path, override_prompt=drawing_prompt, filename_prefix=f"impostor-{timestamp}")
+            if self._comfy.queue_prompt():
                 log_json_entry(
                     LogType.COMFY_PROMPT,
                     {"message": "ComfyUI drawing queued successfully", "drawing_prompt": drawing_prompt},
@@ -1,13 +1,17 @@
+import atexit
 import json
 import os
+import orjson
+import queue
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, BinaryIO, Dict, Optional, List, Tuple, Union
 from datetime import datetime
-import importlib.util
 
-from config.config import OLLAMA_MODEL
+from config.config import EVENT_LOG_FLUSH_BATCH, EVENT_LOG_FLUSH_INTERVAL, OLLAMA_MODEL
 
 
 class LogType(Enum):
@@ -31,18 +35,35 @@ class LogType(Enum):
     NEW_DRAWING = "new_drawing"
 
 
+# orjson equivalent of json.dump(..., indent=2, ensure_ascii=False); numpy scalars show up in mood values
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+# Background writer: callers enqueue serialised entries, one thread batches them per file and appends each batch in place
+_log_queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+_started_logs: set = set()  # run log paths whose metadata entry has been queued
+_start_lock = threading.Lock()
+_log_writer: Optional[threading.Thread] = None
+_log_files: Dict[str, Tuple[BinaryIO, Optional[int]]] = {}  # path -> (open file, offset of the closing "\n]"); writer thread only
+_read_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_log_lock = threading.Lock()
+_read_lock = threading.Lock()
+
 # Global run ID - generated once per application run
 _current_run_id: Optional[str] = None
 _config_metadata: Optional[Dict[str, Any]] = None
 _start_time: Optional[float] = None
+_elapsed_cache: Tuple[int, str] = (-1, "")  # (elapsed seconds, HH:MM:SS) reused by every log in the same second
+_iso_cache: Tuple[int, str] = (-1, "")  # (timestamp, isoformat) reused by every log in the same second
 
 
 def get_current_run_id() -> str:
     """Get or generate the current run ID."""
     global _current_run_id
-    if _current_run_id is None:
-        _current_run_id = str(uuid.uuid4())[:8]  # Use first 8 chars for readability
-    return _current_run_id
+    run_id = _current_run_id
+    if run_id is None:
+        run_id = _current_run_id = str(uuid.uuid4())[:8]  # Use first 8 chars for readability
+    return run_id
 
 
 def set_run_id(run_id: str) -> None:
@@ -59,15 +80,27 @@ def set_start_time(start_time: float) -> None:
 
 def get_elapsed_time() -> str:
     """Get elapsed time since start as formatted string (HH:MM:SS)."""
-    global _start_time
-    if _start_time is None:
+    start = _start_time
+    if start is None:
         return "00:00:00"
 
-    elapsed = time.time() - _start_time
-    hours = int(elapsed // 3600)
-    minutes = int((elapsed % 3600) // 60)
-    seconds = int(elapsed % 60)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    global _elapsed_cache
+    elapsed = int(time.time() - start)
+    cached = _elapsed_cache
+    if cached[0] != elapsed:
+        minutes, seconds = divmod(elapsed, 60)
+        hours, minutes = divmod(minutes, 60)
+        cached = _elapsed_cache = (elapsed, f"{hours:02d}:{minutes:02d}:{seconds:02d}")
+    return cached[1]
+
+
+def _iso_timestamp(timestamp: int) -> str:
+    """ISO string for a whole-second timestamp, formatted once per second."""
+    global _iso_cache
+    cached = _iso_cache
+    if cached[0] != timestamp:
+        cached = _iso_cache = (timestamp, datetime.fromtimestamp(timestamp).isoformat())
+    return cached[1]
 
 
 def event_print(message: str, event_type: Optional[str] = None, data: Optional[Dict[str, Any]] = None, log_dir: str = "mood_snapshots") -> None:
@@ -97,26 +130,15 @@ def load_config_metadata() -> Dict[str, Any]:
     if _config_metadata is not None:
         return _config_metadata
 
-    # Try to load config.py
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "config.py")
-    if not os.path.exists(config_path):
-        _config_metadata = {}
-        return _config_metadata
-
     try:
-        spec = importlib.util.spec_from_file_location("config", config_path)
-        config = importlib.util.module_from_spec(spec)  # type: ignore
-        spec.loader.exec_module(config)  # type: ignore
+        from config import config
 
         # Extract all uppercase variables (config constants)
-        config_vars = {name: getattr(config, name) for name in dir(config) if not name.startswith("_") and name.isupper()}
-
-        _config_metadata = config_vars
-        return _config_metadata
+        _config_metadata = {name: value for name, value in vars(config).items() if name.isupper() and not name.startswith("_")}
     except Exception as e:
         print(f"[⚠️] Error loading config metadata: {e}")
         _config_metadata = {}
-        return _config_metadata
+    return _config_metadata
 
 
 def create_run_metadata(run_id: str) -> Dict[str, Any]:
@@ -133,24 +155,106 @@ def create_run_metadata(run_id: str) -> Dict[str, Any]:
 
 def update_all_run_log(log_dir: str, entry: Dict[str, Any]) -> None:
     """Update the aggregated all-run-log.json file with a log entry."""
-    all_run_log_path = os.path.join(log_dir, "all-run-log.json")
+    _enqueue_log(os.path.join(log_dir, "all-run-log.json"), _serialise_entry(entry))
+
+
+def _serialise_entry(entry: Dict[str, Any]) -> bytes:
+    """An entry as it appears inside an indented JSON array: serialised now, so later mutation by the caller cannot leak in."""
+    return orjson.dumps(entry, option=_JSON_OPTS).replace(b"\n", b"\n  ")
+
+
+def _enqueue_log(filepath: str, chunk: bytes) -> None:
+    global _log_writer
+    if _log_writer is None:
+        with _log_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(target=_log_writer_loop, name="event-log-writer", daemon=True)
+                _log_writer.start()
+                # atexit runs last-registered first: drain the queue, then close the cached files
+                atexit.register(_close_log_files)
+                atexit.register(flush_logs)
+    _log_queue.put((filepath, chunk))
 
-    # Load existing entries
-    all_entries = []
-    if os.path.exists(all_run_log_path):
-        try:
-            with open(all_run_log_path, "r", encoding="utf-8") as f:
-                all_entries = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            all_entries = []
 
-    # Add new log entry
-    all_entries.append(entry)
+def flush_logs() -> None:
+    """Block until every queued log entry has been written."""
+    if _log_writer is not None and _log_writer.is_alive():
+        _log_queue.join()
 
-    # Write back to file
-    os.makedirs(log_dir, exist_ok=True)
-    with open(all_run_log_path, "w", encoding="utf-8") as f:
-        json.dump(all_entries, f, indent=2, ensure_ascii=False)
+
+def _open_log(filepath: str) -> Tuple[BinaryIO, Optional[int]]:
+    """Open a log for appending: the file and the offset of the newline before its closing "]", or None while it holds no entries."""
+    try:
+        f = open(filepath, "r+b")
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        return open(filepath, "w+b"), None
+
+    end = f.seek(0, os.SEEK_END)
+    if end >= 4:
+        f.seek(end - 2)
+        if f.read(2) == b"\n]":
+            return f, end - 2
+
+    # Empty, "[]" or not a file we wrote: rebuild the array around whatever entries it holds
+    f.seek(0)
+    try:
+        existing = orjson.loads(f.read())
+    except orjson.JSONDecodeError:
+        existing = []
+    chunks = [_serialise_entry(e) for e in existing] if isinstance(existing, list) else []
+    f.seek(0)
+    f.truncate()
+    if not chunks:
+        return f, None
+    f.write(b"[\n  " + b",\n  ".join(chunks) + b"\n]")
+    return f, f.tell() - 2
+
+
+def _append_chunks(filepath: str, chunks: List[bytes]) -> None:
+    """Append entries to a JSON array file by overwriting only its closing bracket."""
+    cached = _log_files.get(filepath)
+    f, tail = cached if cached is not None else _open_log(filepath)
+    _log_files[filepath] = (f, tail)
+    body = b",\n  ".join(chunks)
+    if tail is None:
+        f.seek(0)
+        f.write(b"[\n  " + body + b"\n]")
+    else:
+        f.seek(tail)
+        f.write(b",\n  " + body + b"\n]")
+    f.flush()
+    _log_files[filepath] = (f, f.tell() - 2)
+
+
+def _close_log_files() -> None:
+    for f, _ in _log_files.values():
+        f.close()
+    _log_files.clear()
+
+
+def _log_writer_loop() -> None:
+    while True:
+        batch = [_log_queue.get()]
+        deadline = time.monotonic() + EVENT_LOG_FLUSH_INTERVAL
+        while len(batch) < EVENT_LOG_FLUSH_BATCH:
+            try:
+                batch.append(_log_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        by_file: Dict[str, List[bytes]] = {}
+        for filepath, chunk in batch:
+            by_file.setdefault(filepath, []).append(chunk)
+        for filepath, chunks in by_file.items():
+            try:
+                _append_chunks(filepath, chunks)
+            except OSError as exc:
+                print(f"[⚠️] Error writing event log: {exc}")
+                cached = _log_files.pop(filepath, None)
+                if cached is not None:
+                    cached[0].close()
+        for _ in batch:
+            _log_queue.task_done()
 
 
 def log_json_entry(
@@ -182,7 +286,7 @@ def log_json_entry(
     log_type_str = log_type.value if isinstance(log_type, LogType) else log_type
 
     timestamp = int(time.time())
-    iso_timestamp = datetime.fromtimestamp(timestamp).isoformat()
+    iso_timestamp = _iso_timestamp(timestamp)
     elapsed_time = get_elapsed_time()
 
     # Create the log entry
@@ -192,45 +296,57 @@ def log_json_entry(
     filename = f"{run_id}-event-log.json"
     filepath = os.path.join(log_dir, filename)
 
-    # Ensure directory exists
-    os.makedirs(log_dir, exist_ok=True)
-
     # Check if this is a new run log file and create metadata if needed
-    if not os.path.exists(filepath):
-        # Create run metadata with config values
-        run_metadata = create_run_metadata(run_id)
-
-        # Create the run log file with metadata as first entry
-        metadata_entry = {
-            "timestamp": timestamp,
-            "iso_timestamp": iso_timestamp,
-            "type": LogType.RUN_METADATA.value,
-            "run_id": run_id,
-            **run_metadata,
-        }
+    if filepath not in _started_logs:
+        _start_run_log(filepath, log_dir, run_id, timestamp, iso_timestamp)
 
-        # Write metadata entry first to individual run log
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump([metadata_entry], f, indent=2, ensure_ascii=False)
-
-        # Also add metadata to all-run-log.json
-        update_all_run_log(log_dir, metadata_entry)
-
-    # Append to the individual run event log file
-    append_to_log_file(log_dir, filename, entry)
-
-    # Also append to all-run-log.json
-    update_all_run_log(log_dir, entry)
+    # Append to the individual run event log file and to all-run-log.json
+    chunk = _serialise_entry(entry)
+    _enqueue_log(filepath, chunk)
+    _enqueue_log(os.path.join(log_dir, "all-run-log.json"), chunk)
 
     # Auto-print if requested
     if auto_print:
         message = print_message or data.get("message", f"{log_type_str} event")
-        elapsed = get_elapsed_time()
-        print(f"[{elapsed}] {message}")
+        print(f"[{elapsed_time}] {message}")
 
     return filepath
 
 
+def _start_run_log(filepath: str, log_dir: str, run_id: str, timestamp: int, iso_timestamp: str) -> None:
+    """Queue the run metadata entry ahead of any other entry for a run log that does not exist yet."""
+    with _start_lock:
+        if filepath in _started_logs:
+            return
+        if not os.path.exists(filepath):
+            # Create run metadata with config values
+            run_metadata = create_run_metadata(run_id)
+
+            # Create the run log file with metadata as first entry
+            metadata_entry = {
+                "timestamp": timestamp,
+                "iso_timestamp": iso_timestamp,
+                "type": LogType.RUN_METADATA.value,
+                "run_id": run_id,
+                **run_metadata,
+            }
+
+            # Write metadata entry first to individual run log, then to all-run-log.json
+            chunk = _serialise_entry(metadata_entry)
+            _enqueue_log(filepath, chunk)
+            _enqueue_log(os.path.join(log_dir, "all-run-log.json"), chunk)
+        _started_logs.add(filepath)
+
+
+def _read_json_file(path: str) -> Any:
+    """Parsed contents of a JSON file, or the exception that stopped it being read."""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (json.JSONDecodeError, IOError) as e:
+        return e
+
+
 def read_json_logs(log_dir: str, log_type: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Read and parse JSON log files from a directory.
@@ -240,57 +356,74 @@ def read_json_logs(log_dir: str, log_type: Optional[str] = None) -> List[Dict[st
         log_type: Optional filter by log type
 
     Returns:
-        List of parsed log entries, sorted by timestamp
+        List of parsed log entries, sorted by timestamp. The entries are the cached objects themselves and must not be mutated.
     """
-    if not os.path.exists(log_dir):
+    flush_logs()
+    try:
+        with os.scandir(log_dir) as it:
+            files = [(entry.name, entry.path, entry.stat()) for entry in it if entry.name.endswith(".json") and entry.is_file()]
+    except FileNotFoundError:
         return []
 
+    listed = {path for _, path, _ in files}
+    folder = os.path.dirname(os.path.join(log_dir, ""))
+    parsed: Dict[str, Any] = {}
+    with _read_lock:
+        for path in [path for path in _read_cache if path not in listed and os.path.dirname(path) == folder]:
+            del _read_cache[path]
+        stale = [(path, (st.st_mtime_ns, st.st_size)) for _, path, st in files if _read_cache.get(path, (None,))[0] != (st.st_mtime_ns, st.st_size)]
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(len(stale), 8), thread_name_prefix="log-read") as pool:
+                for (path, key), data in zip(stale, pool.map(_read_json_file, [path for path, _ in stale])):
+                    if isinstance(data, Exception):
+                        print(f"[⚠️] Error reading log file {path}: {data}")
+                        _read_cache.pop(path, None)
+                    elif os.path.basename(path) == "all-run-log.json":
+                        parsed[path] = data
+                    else:
+                        _read_cache[path] = (key, data)
+        for path in listed:
+            if path in _read_cache:
+                parsed[path] = _read_cache[path][1]
+
     logs = []
-    for filename in os.listdir(log_dir):
-        if not filename.endswith(".json"):
+    for filename, filepath, _ in files:
+        if filepath not in parsed:
             continue
-
-        filepath = os.path.join(log_dir, filename)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Handle different log file formats
-            if filename.endswith("-event-log.json") or filename.startswith("event_log_"):
-                # Event log format: array of entries (new and old format)
-                if isinstance(data, list):
-                    for entry in data:
-                        if isinstance(entry, dict):
-                            # Filter by log type if specified
-                            if log_type and entry.get("type") != log_type:
-                                continue
-                            logs.append(entry)
-                else:
-                    # Single entry format
-                    if isinstance(data, dict):
-                        if log_type and data.get("type") != log_type:
+        data = parsed[filepath]
+
+        # Handle different log file formats
+        if filename.endswith("-event-log.json") or filename.startswith("event_log_"):
+            # Event log format: array of entries (new and old format)
+            if isinstance(data, list):
+                for entry in data:
+                    if isinstance(entry, dict):
+                        # Filter by log type if specified
+                        if log_type and entry.get("type") != log_type:
                             continue
-                        logs.append(data)
+                        logs.append(entry)
             else:
-                # Old format: single entry per file
-                # New format: log-<timestamp>-<logtype>.json
-                # Old format: <logtype>_<timestamp>.json or <prefix>_<timestamp>.json
+                # Single entry format
                 if isinstance(data, dict):
-                    # Filter by log type if specified
                     if log_type and data.get("type") != log_type:
                         continue
                     logs.append(data)
-                elif isinstance(data, list):
-                    # Handle array format
-                    for entry in data:
-                        if isinstance(entry, dict):
-                            if log_type and entry.get("type") != log_type:
-                                continue
-                            logs.append(entry)
-
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"[⚠️] Error reading log file {filepath}: {e}")
-            continue
+        else:
+            # Old format: single entry per file
+            # New format: log-<timestamp>-<logtype>.json
+            # Old format: <logtype>_<timestamp>.json or <prefix>_<timestamp>.json
+            if isinstance(data, dict):
+                # Filter by log type if specified
+                if log_type and data.get("type") != log_type:
+                    continue
+                logs.append(data)
+            elif isinstance(data, list):
+                # Handle array format
+                for entry in data:
+                    if isinstance(entry, dict):
+                        if log_type and entry.get("type") != log_type:
+                            continue
+                        logs.append(entry)
 
     # Sort by timestamp
     logs.sort(key=lambda x: x.get("timestamp", 0))
@@ -321,24 +454,7 @@ def append_to_log_file(log_dir: str, filename: str, entry: Dict[str, Any]) -> No
         filename: Name of the log file
         entry: Dictionary to append
     """
-    filepath = os.path.join(log_dir, filename)
-    os.makedirs(log_dir, exist_ok=True)
-
-    # Read existing entries
-    entries = []
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                entries = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            entries = []
-
-    # Append new entry
-    entries.append(entry)
-
-    # Write back to file
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    _enqueue_log(os.path.join(log_dir, filename), _serialise_entry(entry))
 
 
 # def read_evaluations(log_dir: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
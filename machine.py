@@ -1,8 +1,9 @@
 import time
 import argparse
 import sys
-import cv2
+import queue
 import threading
+import cv2
 
 
 def parse_args():
@@ -114,6 +115,8 @@ mood_engine = MoodEngine()
 captioner = Captioner()
 
 best_box = None
+mood_queue: "queue.Queue" = queue.Queue(maxsize=1)
+mood_busy = threading.Event()
 
 
 def mood_update_thread(frame, timestamp):
@@ -122,19 +125,33 @@ def mood_update_thread(frame, timestamp):
         now = time.time()
         if now - last_snapshot_time >= 10:
             snapshot_path = get_run_image_path(MOOD_SNAPSHOT_FOLDER, f"mood_{int(now)}.jpg")
-            cv2.imwrite(snapshot_path, frame)
             mood_engine.update_feeling_brain(frame, image_path=snapshot_path)
             try:
                 captioner.update(
                     frame=frame,
                     person_present=best_box is not None,
                     mood=mood_engine.get_current_mood(),
+                    copy=False,  # this frame is the worker's own copy
                 )
             except Exception:
                 pass
             last_snapshot_time = now
 
 
+def mood_worker():
+    while True:
+        frame, timestamp = mood_queue.get()
+        try:
+            mood_update_thread(frame, timestamp)
+        except Exception as e:
+            print(f"[⚠️] Mood update failed: {e}")
+        finally:
+            mood_busy.clear()
+
+
+threading.Thread(target=mood_worker, name="mood", daemon=True).start()
+
+
 try:
     while True:
         ret, frame = cap.read()
@@ -164,8 +181,9 @@ try:
                 best_box = box.astype("int")
                 best_conf = conf
 
-        if now - last_mood_time > MOOD_EVALUATION_INTERVAL:
-            threading.Thread(target=mood_update_thread, args=(frame.copy(), int(now)), daemon=True).start()
+        if now - last_mood_time > MOOD_EVALUATION_INTERVAL and not mood_busy.is_set():
+            mood_busy.set()
+            mood_queue.put_nowait((frame.copy(), int(now)))
             last_mood_time = now
 
         current_mood = mood_engine.get_current_mood()
@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 import os
+import re
 import time
 import json
-import cv2  # type: ignore
 import numpy as np  # type: ignore
 from typing import List, Optional
 
 from config.config import MOOD_SNAPSHOT_FOLDER, OLLAMA_TIMEOUT_SUMMARY
 from event_logging.event_logger import log_json_entry, read_json_logs, LogType
 from utils.ollama import query_ollama
+from utils.image_io import encode_jpeg, write_async
 from event_logging.run_manager import get_run_image_path
 
+_PERSON_RE = re.compile(r"person|individual", re.IGNORECASE)
+
 
 # ---------------------------------------------------------------------------#
 # Snapshot‑based MoodEngine (your original code, updated with timeout)       #
@@ -26,8 +29,8 @@ class MoodEngine:
 
     # -------------------------------------------------------------- main hook
     def update_feeling_brain(self, frame, image_path: Optional[str] = None):
-        caption = self.generate_caption(frame)
-        saw_person = "person" in caption.lower() or "individual" in caption.lower()
+        caption = self.generate_caption(frame, image_path=image_path)
+        saw_person = _PERSON_RE.search(caption) is not None
 
         novelty = self.calculate_novelty(caption)
         mood_change = self.compute_mood_change(novelty, saw_person)
@@ -76,18 +79,19 @@ class MoodEngine:
         return change
 
     # -------------------------------------------------------- LLaVA caption
-    def generate_caption(self, frame, timeout: int = OLLAMA_TIMEOUT_SUMMARY):
-
-        timestamp = int(time.time())
-        image_filename = f"caption_frame_{timestamp}.jpg"
-        image_path = get_run_image_path(MOOD_SNAPSHOT_FOLDER, image_filename)
+    def generate_caption(self, frame, image_path: Optional[str] = None, timeout: int = OLLAMA_TIMEOUT_SUMMARY):
 
-        cv2.imwrite(image_path, frame)
+        if image_path is None:
+            timestamp = int(time.time())
+            image_filename = f"caption_frame_{timestamp}.jpg"
+            image_path = get_run_image_path(MOOD_SNAPSHOT_FOLDER, image_filename)
 
         prompt = "Describe the scene"
 
         try:
-            response_text = query_ollama(prompt=prompt, image=image_path, timeout=timeout, log_dir=MOOD_SNAPSHOT_FOLDER)
+            jpeg = encode_jpeg(frame)
+            write_async(image_path, jpeg)
+            response_text = query_ollama(prompt=prompt, image=jpeg, timeout=timeout, log_dir=MOOD_SNAPSHOT_FOLDER)
             return response_text
         except Exception as e:
             error_msg = f"Error: {e}"
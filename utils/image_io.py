@@ -0,0 +1,70 @@
+"""
+image_io.py
+-----------
+In-memory JPEG encoding for snapshots, plus a background writer for saving them.
+"""
+
+import atexit
+import queue
+import threading
+from typing import Optional, Tuple
+
+import cv2  # type: ignore
+import numpy as np  # type: ignore
+
+from config.config import MOOD_SNAPSHOT_FOLDER, SNAPSHOT_JPEG_QUALITY, SNAPSHOT_MAX_EDGE
+from event_logging.event_logger import log_json_entry, LogType
+
+_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, SNAPSHOT_JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+
+_write_queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def encode_jpeg(frame: np.ndarray) -> bytes:
+    """Encode a BGR frame to JPEG bytes without touching the disk, downscaling oversized frames first."""
+    h, w = frame.shape[:2]
+    scale = SNAPSHOT_MAX_EDGE / max(h, w)
+    if scale < 1:
+        frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", frame, _JPEG_PARAMS)
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return buf.tobytes()
+
+
+def write_async(path: str, data: bytes) -> None:
+    """Queue encoded image bytes to be written to `path` by the background writer."""
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_disk_writer, name="snapshot-writer", daemon=True)
+                _writer_thread.start()
+                atexit.register(flush_writes)
+    _write_queue.put((path, data))
+
+
+def flush_writes() -> None:
+    """Block until every queued snapshot has been written."""
+    if _writer_thread is not None and _writer_thread.is_alive():
+        _write_queue.join()
+
+
+def _disk_writer() -> None:
+    while True:
+        path, data = _write_queue.get()
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as exc:
+            log_json_entry(
+                LogType.ERROR,
+                {"message": f"Snapshot write error: {exc}", "component": "image_io", "image_path": path},
+                MOOD_SNAPSHOT_FOLDER,
+                auto_print=True,
+                print_message=f"⚠️ Snapshot write error: {exc}",
+            )
+        finally:
+            _write_queue.task_done()
@@ -1,12 +1,36 @@
 import os
+from functools import lru_cache
 
 # import time
-import base64
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Union
-from config.config import MOOD_SNAPSHOT_FOLDER, OLLAMA_MODEL
+from config.config import MOOD_SNAPSHOT_FOLDER, OLLAMA_KEEP_ALIVE, OLLAMA_MODEL, OLLAMA_NUM_KEEP
 from event_logging.event_logger import log_json_entry, LogType
 
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+_SESSION.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+
+
+@lru_cache(maxsize=8)
+def _b64_image(path: str, mtime_ns: int, size: int) -> str:
+    """Base64 of an image file, re-read when its mtime or size changes."""
+    with open(path, "rb") as img_file:
+        return base64.b64encode(img_file.read()).decode("utf-8")
+
+
+@lru_cache(maxsize=8)
+def _b64_bytes(data: bytes) -> str:
+    """Base64 of encoded image bytes."""
+    return base64.b64encode(data).decode("utf-8")
+
 
 def log_ollama_call(
     prompt: str,
@@ -60,6 +84,19 @@ def log_ollama_call(
     return log_json_entry(LogType.OLLAMA_API_CALL, data, log_dir)
 
 
+def warm_up(model: str = OLLAMA_MODEL, timeout: int = 120) -> bool:
+    """Ask Ollama to load `model` into memory ahead of the first real request."""
+    try:
+        response = _SESSION.post(
+            "http://localhost:11434/api/generate", data=orjson.dumps({"model": model, "keep_alive": OLLAMA_KEEP_ALIVE}), timeout=timeout
+        )
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"[⚠️] Ollama warm-up failed: {e}")
+        return False
+
+
 def query_ollama(
     prompt: str,
     model: str = OLLAMA_MODEL,
@@ -83,7 +120,7 @@ def query_ollama(
         Response text from Ollama
     """
     # Prepare the payload
-    payload = {"model": model, "prompt": prompt, "stream": False}
+    payload = {"model": model, "prompt": prompt, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE, "options": {"num_keep": OLLAMA_NUM_KEEP}}
     # payload = {"model": model, "prompt": prompt, "stream": False, "options": {"temperature": 0}}
 
     # Add system prompt if provided
@@ -97,25 +134,22 @@ def query_ollama(
             # Assume it's a file path
             if os.path.exists(image):
                 image_path = image
-                with open(image, "rb") as img_file:
-                    img_bytes = img_file.read()
-                    img_b64 = base64.b64encode(img_bytes).decode("utf-8")
-                    payload["images"] = [img_b64]
+                st = os.stat(image)
+                payload["images"] = [_b64_image(image, st.st_mtime_ns, st.st_size)]
             else:
                 # Assume it's already base64 encoded
                 payload["images"] = [image]
         elif isinstance(image, bytes):
             # Raw bytes, encode to base64
-            img_b64 = base64.b64encode(image).decode("utf-8")
-            payload["images"] = [img_b64]
+            payload["images"] = [_b64_bytes(image)]
     else:
         payload["images"] = []
 
     try:
-        response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=timeout)
+        response = _SESSION.post("http://localhost:11434/api/generate", data=orjson.dumps(payload), timeout=timeout)
         response.raise_for_status()
 
-        response_text = response.json().get("response", "")
+        response_text = orjson.loads(response.content).get("response", "")
 
         # Log successful call
         log_ollama_call(